@@ -17,7 +17,9 @@ This demonstrates how proper default features enhance user experience in game ap
 
 import random
 import os
+import sys
 import time
+from functools import lru_cache
 
 # Game variables
 player_cards = []
@@ -30,9 +32,29 @@ wins = 0
 losses = 0
 draws = 0
 
+# Card values in one suit (Ace=11, face cards=10), built once at import
+_DECK = (11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+_randrange = random.randrange
+
+# ANSI sequence: erase the whole display, then move the cursor home
+_CLEAR = "\x1b[2J\x1b[H"
+# Dumb terminals do not understand ANSI escapes, so fall back to the shell
+_DUMB_TERMINAL = os.environ.get("TERM") == "dumb"
+
+# Board lines from the previous display_cards() call (None forces a full redraw)
+_last_lines = None
+
+if os.name == 'nt':
+    # An empty system() call switches the Windows console into VT processing mode
+    os.system('')
+
 def clear_screen():
     """Clear the terminal screen for better user experience."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if _DUMB_TERMINAL:
+        os.system('cls' if os.name == 'nt' else 'clear')
+        return
+    sys.stdout.write(_CLEAR)
+    sys.stdout.flush()
 
 def deal_card():
     """Return a random card from the deck.
@@ -40,8 +62,27 @@ def deal_card():
     Returns:
         int: Card value (Ace=11, face cards=10)
     """
-    cards = [11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10]
-    return random.choice(cards)
+    return _DECK[_randrange(13)]
+
+@lru_cache(maxsize=4096)
+def _score_sorted(cards):
+    """Score a hand given as a sorted tuple of card values (see calculate_score)."""
+    total = 0
+    aces = 0
+    for card in cards:
+        total += card
+        if card == 11:
+            aces += 1
+
+    if total == 21 and len(cards) == 2:
+        return 0  # Blackjack (Ace + 10)
+
+    # Count Aces as 1 instead of 11 until the hand no longer busts
+    while total > 21 and aces:
+        total -= 10
+        aces -= 1
+
+    return total
 
 def calculate_score(cards):
     """Calculate the score of a hand, handling Aces appropriately.
@@ -52,36 +93,121 @@ def calculate_score(cards):
     Returns:
         int: Score value (0 = Blackjack)
     """
-    if sum(cards) == 21 and len(cards) == 2:
-        return 0  # Blackjack (Ace + 10)
-    
-    if 11 in cards and sum(cards) > 21:
-        cards.remove(11)
-        cards.append(1)
-    
-    return sum(cards)
+    # Card order does not affect the score, so sorted hands share cache entries
+    return _score_sorted(tuple(sorted(cards)))
+
+# Dealer final-total order used by dealer_probs(): 17, 18, 19, 20, 21, bust
+_DEALER_OUTCOMES = (17, 18, 19, 20, 21, "bust")
+
+def _dealer_outcomes(total, soft_aces, memo):
+    """Return the dealer's final-outcome distribution from a given hand state.
+
+    Cards are drawn uniformly from _DECK (an infinite deck) and the dealer
+    hits until reaching at least 17, counting an Ace as 1 only to avoid busting.
+
+    Args:
+        total (int): Current hand total with every Ace counted as 11
+        soft_aces (int): Number of Aces still counted as 11
+        memo (dict): Results already computed, keyed by (total, soft_aces)
+
+    Returns:
+        tuple: Probabilities ordered as _DEALER_OUTCOMES
+    """
+    while total > 21 and soft_aces:
+        total -= 10
+        soft_aces -= 1
+
+    if total > 21:
+        return (0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+    if total >= 17:
+        probs = [0.0] * 6
+        probs[total - 17] = 1.0
+        return tuple(probs)
+
+    key = (total, soft_aces)
+    if key not in memo:
+        probs = [0.0] * 6
+        for card in _DECK:
+            for i, p in enumerate(_dealer_outcomes(total + card, soft_aces + (card == 11), memo)):
+                probs[i] += p / len(_DECK)
+        memo[key] = tuple(probs)
+    return memo[key]
+
+def _build_dealer_cache():
+    """Precompute the dealer outcome distribution for every possible upcard."""
+    memo = {}
+    return {upcard: _dealer_outcomes(upcard, int(upcard == 11), memo)
+            for upcard in sorted(set(_DECK))}
+
+# Dealer outcome distributions keyed by upcard, built once at import
+_DEALER_CACHE = _build_dealer_cache()
+
+def dealer_probs(upcard):
+    """Return the probability of each dealer final outcome given the upcard.
+
+    Args:
+        upcard (int): Dealer's visible card value (Ace=11)
+
+    Returns:
+        tuple: Probabilities of finishing on 17, 18, 19, 20, 21 and busting
+    """
+    return _DEALER_CACHE[upcard]
+
+def _render_cards():
+    """Build the lines of the game board for the current state.
+
+    Returns:
+        list: Board lines, without trailing newlines
+    """
+    lines = [
+        "=" * 50,
+        "BLACKJACK".center(50),
+        "=" * 50,
+        f"Score: {wins} Wins, {losses} Losses, {draws} Draws",
+        "-" * 50,
+        f"Your cards: {player_cards}",
+        f"Your score: {player_score}",
+        "",
+    ]
 
-def display_cards():
-    """Display the current game state including scores and cards."""
-    clear_screen()
-    print("=" * 50)
-    print("BLACKJACK".center(50))
-    print("=" * 50)
-    print(f"Score: {wins} Wins, {losses} Losses, {draws} Draws")
-    print("-" * 50)
-    
-    print("Your cards:", player_cards)
-    print("Your score:", player_score)
-    print()
-    
     if game_over:
-        print("Dealer's cards:", dealer_cards)
-        print("Dealer's score:", dealer_score)
+        lines.append(f"Dealer's cards: {dealer_cards}")
+        lines.append(f"Dealer's score: {dealer_score}")
     else:
-        print(f"Dealer's cards: [{dealer_cards[0]}, ?]")
-        print(f"Dealer's visible score: {dealer_cards[0]}")
-    
-    print("-" * 50)
+        lines.append(f"Dealer's cards: [{dealer_cards[0]}, ?]")
+        lines.append(f"Dealer's visible score: {dealer_cards[0]}")
+
+    lines.append("-" * 50)
+    return lines
+
+def display_cards():
+    """Display the current game state including scores and cards.
+
+    Only the board lines that changed since the previous draw are rewritten;
+    the whole screen is cleared on the first draw or after another screen
+    (help, welcome) has been shown.
+    """
+    global _last_lines
+    lines = _render_cards()
+
+    if _last_lines is None or _DUMB_TERMINAL or len(lines) != len(_last_lines):
+        if _DUMB_TERMINAL:
+            clear_screen()
+            out = []
+        else:
+            out = [_CLEAR]
+        out.append("\n".join(lines) + "\n")
+    else:
+        out = [f"\x1b[{i + 1};1H\x1b[2K{line}"
+               for i, line in enumerate(lines) if line != _last_lines[i]]
+        # Park the cursor under the board and wipe any old prompts below it
+        out.append(f"\x1b[{len(lines) + 1};1H\x1b[J")
+
+    # One write per frame instead of one per line
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
+
+    _last_lines = lines
 
 def compare(user_score, computer_score):
     """Compare player and dealer scores to determine the winner.
@@ -126,6 +252,48 @@ def pause_game():
     paused = False
     display_cards()
 
+# Player action handlers for play_game(). Each returns None to keep playing,
+# or a bool that play_game() returns directly (True to restart, False to exit).
+def _hit():
+    """Deal the player another card."""
+    global player_score
+    player_cards.append(deal_card())
+    player_score = calculate_score(player_cards)
+    display_cards()
+
+def _stand():
+    """End the player's turn."""
+    global game_over
+    game_over = True
+    display_cards()
+
+def _pause():
+    """Pause until the player presses Enter."""
+    pause_game()
+
+def _quit():
+    """Exit the game."""
+    print("Thanks for playing!")
+    return False
+
+def _restart():
+    """Abandon this hand and start a new game."""
+    return True
+
+def _invalid_action():
+    """Report an unrecognised action and redraw the board."""
+    print("Invalid action. Please try again.")
+    time.sleep(1)
+    display_cards()
+
+_ACTIONS = {
+    'h': _hit,
+    's': _stand,
+    'p': _pause,
+    'q': _quit,
+    'r': _restart,
+}
+
 def play_game():
     """Main game loop handling player actions and game logic.
     
@@ -134,16 +302,11 @@ def play_game():
     """
     global player_cards, dealer_cards, game_over, player_score, dealer_score
     
-    # Reset game state
-    player_cards = []
-    dealer_cards = []
+    # Reset game state and deal initial cards
+    player_cards = [deal_card() for _ in range(2)]
+    dealer_cards = [deal_card() for _ in range(2)]
     game_over = False
     
-    # Deal initial cards
-    for _ in range(2):
-        player_cards.append(deal_card())
-        dealer_cards.append(deal_card())
-    
     player_score = calculate_score(player_cards)
     dealer_score = calculate_score(dealer_cards)
     
@@ -151,10 +314,6 @@ def play_game():
     
     # Player's turn
     while not game_over:
-        if paused:
-            time.sleep(0.1)
-            continue
-            
         player_score = calculate_score(player_cards)
         dealer_score = calculate_score(dealer_cards)
         
@@ -164,24 +323,9 @@ def play_game():
             print("Actions: [H]it, [S]tand, [P]ause, [Q]uit, [R]estart")
             choice = input("> ").lower()
             
-            if choice == 'h':
-                player_cards.append(deal_card())
-                player_score = calculate_score(player_cards)
-                display_cards()
-            elif choice == 's':
-                game_over = True
-                display_cards()
-            elif choice == 'p':
-                pause_game()
-            elif choice == 'q':
-                print("Thanks for playing!")
-                return False  # Exit game
-            elif choice == 'r':
-                return True  # Restart game
-            else:
-                print("Invalid action. Please try again.")
-                time.sleep(1)
-                display_cards()
+            outcome = _ACTIONS.get(choice, _invalid_action)()
+            if outcome is not None:
+                return outcome  # True restarts the game, False exits
     
     # Dealer's turn
     while dealer_score != 0 and dealer_score < 17 and player_score <= 21:
@@ -206,25 +350,31 @@ def play_game():
 
 def display_help():
     """Display game rules and controls."""
+    global _last_lines
+    _last_lines = None
     clear_screen()
-    print("=" * 50)
-    print("BLACKJACK HELP".center(50))
-    print("=" * 50)
-    print("Game Rules:")
-    print("1. You and the dealer each receive two cards")
-    print("2. Cards 2-10 are worth their face value")
-    print("3. Face cards (J/Q/K) are worth 10 points")
-    print("4. Aces are worth 11 or 1 points (automatically adjusted)")
-    print("5. The goal is to get as close to 21 as possible without exceeding it")
-    print("6. The dealer must hit until they have at least 17 points")
-    print("7. If you exceed 21 points, you lose immediately")
-    print("\nControls:")
-    print("  H - Hit (take another card)")
-    print("  S - Stand (end your turn)")
-    print("  P - Pause game")
-    print("  Q - Quit game")
-    print("  R - Restart game")
-    print("\nPress Enter to return to the game...")
+    lines = [
+        "=" * 50,
+        "BLACKJACK HELP".center(50),
+        "=" * 50,
+        "Game Rules:",
+        "1. You and the dealer each receive two cards",
+        "2. Cards 2-10 are worth their face value",
+        "3. Face cards (J/Q/K) are worth 10 points",
+        "4. Aces are worth 11 or 1 points (automatically adjusted)",
+        "5. The goal is to get as close to 21 as possible without exceeding it",
+        "6. The dealer must hit until they have at least 17 points",
+        "7. If you exceed 21 points, you lose immediately",
+        "\nControls:",
+        "  H - Hit (take another card)",
+        "  S - Stand (end your turn)",
+        "  P - Pause game",
+        "  Q - Quit game",
+        "  R - Restart game",
+        "\nPress Enter to return to the game...",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
     input()
 
 def show_welcome():
@@ -233,27 +383,34 @@ def show_welcome():
     Returns:
         bool: True to start game, False to exit
     """
-    clear_screen()
-    print("=" * 50)
-    print("WELCOME TO BLACKJACK".center(50))
-    print("=" * 50)
-    print("\n[1] Start Game")
-    print("[2] Help")
-    print("[3] Exit")
-    
-    choice = input("\nSelect an option: ")
-    if choice == '1':
-        return True
-    elif choice == '2':
-        display_help()
-        return show_welcome()
-    elif choice == '3':
-        print("Thanks for your interest. Goodbye!")
-        return False
-    else:
-        print("Invalid selection. Please try again.")
-        time.sleep(1)
-        return show_welcome()
+    global _last_lines
+    lines = [
+        "=" * 50,
+        "WELCOME TO BLACKJACK".center(50),
+        "=" * 50,
+        "\n[1] Start Game",
+        "[2] Help",
+        "[3] Exit",
+    ]
+
+    # Loop rather than recurse so repeated invalid input does not grow the stack
+    while True:
+        _last_lines = None
+        clear_screen()
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+        choice = input("\nSelect an option: ")
+        if choice == '1':
+            return True
+        elif choice == '2':
+            display_help()
+        elif choice == '3':
+            print("Thanks for your interest. Goodbye!")
+            return False
+        else:
+            print("Invalid selection. Please try again.")
+            time.sleep(1)
 
 def main():
     """Main program entry point."""
@@ -12,21 +12,32 @@ missing important user experience features.
 
 import random
 
+# Card values in one suit (Ace=11, face cards=10), built once at import
+_DECK = (11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+_randrange = random.randrange
+
 def deal_card():
     """Return a random card from the deck."""
-    cards = [11, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10]
-    return random.choice(cards)
+    return _DECK[_randrange(13)]
 
 def calculate_score(cards):
     """Calculate the score of a hand, handling Aces appropriately."""
-    if sum(cards) == 21 and len(cards) == 2:
+    total = 0
+    aces = 0
+    for card in cards:
+        total += card
+        if card == 11:
+            aces += 1
+
+    if total == 21 and len(cards) == 2:
         return 0  # Blackjack (Ace + 10)
-    
-    if 11 in cards and sum(cards) > 21:
-        cards.remove(11)
-        cards.append(1)
-    
-    return sum(cards)
+
+    # Count Aces as 1 instead of 11 until the hand no longer busts
+    while total > 21 and aces:
+        total -= 10
+        aces -= 1
+
+    return total
 
 def compare(user_score, computer_score):
     """Compare player and dealer scores to determine the winner."""
@@ -47,13 +58,9 @@ def compare(user_score, computer_score):
 
 def play_game():
     """Play a single game of Blackjack."""
-    user_cards = []
-    computer_cards = []
-    
     # Deal initial cards
-    for _ in range(2):
-        user_cards.append(deal_card())
-        computer_cards.append(deal_card())
+    user_cards = [deal_card() for _ in range(2)]
+    computer_cards = [deal_card() for _ in range(2)]
     
     # Player's turn
     game_over = False
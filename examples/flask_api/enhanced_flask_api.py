@@ -20,7 +20,8 @@ and all actions are logged to both a file and the console.
 Usage:
   $ python enhanced_flask_api.py
   Then open http://localhost:5000/contacts in your browser or via curl.
-"""
+  The app is served by waitress when it is installed (pip install waitress);
+  set FLASK_DEBUG=1 to run Flask's debug server instead.
 
 Running in Warp Terminal:
 1. Open Warp and navigate to your project directory:
@@ -48,59 +49,101 @@ Running in Warp Terminal:
 
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, g, stream_with_context
 import sqlite3
+import atexit
 import logging
 import os
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
 
 app = Flask(__name__)
 
-# Configure logging to file and console
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("app.log"),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging to file and console. Request threads only render each message
+# (QueueHandler.prepare) and enqueue it; a background listener applies the handler
+# formatters and does the (blocking) file and console writes.
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_file_handler = logging.FileHandler("app.log")
+_file_handler.setFormatter(_log_formatter)
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(_log_formatter)
+
+_log_queue = Queue(-1)
+_log_listener = QueueListener(_log_queue, _file_handler, _console_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
 logger = logging.getLogger(__name__)
 
 # Path to the SQLite database file
 DB_PATH = 'contacts.db'
 
+# SQL statements, defined once so every call passes SQLite's statement cache
+# the same string. Explicit column lists return only the fields the API exposes.
+_SQL_CREATE_TABLE = '''
+    CREATE TABLE IF NOT EXISTS contacts (
+        id    INTEGER PRIMARY KEY AUTOINCREMENT,
+        name  TEXT    NOT NULL,
+        email TEXT    NOT NULL,
+        phone TEXT
+    )
+'''
+_SQL_SELECT_ALL = 'SELECT id, name, email, phone FROM contacts'
+_SQL_SELECT_ONE = 'SELECT id, name, email, phone FROM contacts WHERE id = ?'
+# Also suitable for cursor.executemany() with a list of (name, email, phone) rows
+_SQL_INSERT = 'INSERT INTO contacts (name, email, phone) VALUES (?, ?, ?)'
+_SQL_UPDATE = (
+    'UPDATE contacts SET name = COALESCE(?, name), email = COALESCE(?, email), '
+    'phone = COALESCE(?, phone) WHERE id = ?'
+)
+_SQL_DELETE = 'DELETE FROM contacts WHERE id = ?'
+
 
 def get_db():
     """
-    Open a new database connection. Use row_factory to access columns by name.
+    Return the database connection for the current app context, opening it on
+    first use. Use row_factory to access columns by name.
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    if 'db' not in g:
+        g.db = sqlite3.connect(DB_PATH)
+        g.db.row_factory = sqlite3.Row
+        # WAL makes NORMAL sync durable enough and avoids an fsync per commit
+        g.db.execute('PRAGMA synchronous=NORMAL')
+    return g.db
+
+
+@app.teardown_appcontext
+def close_db(e=None):
+    """
+    Close the database connection opened for this app context, if any.
+    """
+    conn = g.pop('db', None)
+    if conn is not None:
+        conn.close()
 
 
 def init_db():
     """
-    Initialize the database file if it does not exist, creating the contacts table.
+    Initialize the database file if it does not exist, creating the contacts table,
+    and switch it to write-ahead logging so readers do not block on writers.
     """
     logger.info("Initializing database")
     if not os.path.exists(DB_PATH):
-        conn = get_db()
+        conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS contacts (
-                id    INTEGER PRIMARY KEY AUTOINCREMENT,
-                name  TEXT    NOT NULL,
-                email TEXT    NOT NULL,
-                phone TEXT
-            )
-        ''')
+        cursor.execute(_SQL_CREATE_TABLE)
         conn.commit()
         conn.close()
         logger.info("Database initialized successfully")
     else:
         logger.info("Database already exists")
 
+    # journal_mode is persistent, so setting it once per start-up is enough
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.close()
+
 # Perform initial database setup
 init_db()
 
@@ -114,10 +157,10 @@ def handle_exceptions(func):
         try:
             return func(*args, **kwargs)
         except sqlite3.Error as e:
-            logger.error(f"Database error: {e}")
+            logger.error("Database error: %s", e)
             return jsonify({"error": f"Database error: {e}"}), 500
         except Exception as e:
-            logger.error(f"Server error: {e}")
+            logger.error("Server error: %s", e)
             return jsonify({"error": f"Server error: {e}"}), 500
     wrapper.__name__ = func.__name__
     return wrapper
@@ -126,16 +169,33 @@ def handle_exceptions(func):
 @app.route('/contacts', methods=['GET'])
 @handle_exceptions
 def get_contacts():
-    """Retrieve and return all contacts as JSON."""
+    """
+    Retrieve and return all contacts as JSON. Rows are fetched in batches and
+    streamed out as a JSON array, so the full table is never held in memory.
+    The first batch is fetched before the response starts, so a failing query
+    still reaches handle_exceptions instead of breaking a half-sent body.
+    """
     logger.info("Fetching all contacts")
     conn = get_db()
     cursor = conn.cursor()
-    cursor.execute('SELECT * FROM contacts')
-    contacts = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-
-    logger.info(f"Returning {len(contacts)} contacts")
-    return jsonify(contacts)
+    cursor.arraysize = 1000
+    cursor.execute(_SQL_SELECT_ALL)
+    rows = cursor.fetchmany()
+
+    def generate():
+        nonlocal rows
+        count = 0
+        yield '['
+        while rows:
+            for row in rows:
+                # app.json encodes exactly like jsonify (sorted keys, same options)
+                yield (',' if count else '') + app.json.dumps(dict(row))
+                count += 1
+            rows = cursor.fetchmany()
+        yield ']'
+        logger.info("Returned %s contacts", count)
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
 
 @app.route('/contacts', methods=['POST'])
@@ -156,15 +216,11 @@ def add_contact():
 
     conn = get_db()
     cursor = conn.cursor()
-    cursor.execute(
-        'INSERT INTO contacts (name, email, phone) VALUES (?, ?, ?)',
-        (name, email, phone)
-    )
+    cursor.execute(_SQL_INSERT, (name, email, phone))
     conn.commit()
     new_id = cursor.lastrowid
-    conn.close()
 
-    logger.info(f"Contact created with ID: {new_id}")
+    logger.info("Contact created with ID: %s", new_id)
     return jsonify({'message': 'Contact created', 'id': new_id}), 201
 
 
@@ -172,18 +228,17 @@ def add_contact():
 @handle_exceptions
 def get_contact(contact_id):
     """Retrieve a single contact by its ID."""
-    logger.info(f"Fetching contact ID: {contact_id}")
+    logger.info("Fetching contact ID: %s", contact_id)
     conn = get_db()
     cursor = conn.cursor()
-    cursor.execute('SELECT * FROM contacts WHERE id = ?', (contact_id,))
+    cursor.execute(_SQL_SELECT_ONE, (contact_id,))
     row = cursor.fetchone()
-    conn.close()
 
     if row is None:
-        logger.warning(f"Contact ID {contact_id} not found")
+        logger.warning("Contact ID %s not found", contact_id)
         return jsonify({"error": "Contact not found"}), 404
 
-    logger.info(f"Returning contact ID: {contact_id}")
+    logger.info("Returning contact ID: %s", contact_id)
     return jsonify(dict(row))
 
 
@@ -191,37 +246,27 @@ def get_contact(contact_id):
 @handle_exceptions
 def update_contact(contact_id):
     """Update fields of an existing contact. At least one field must be provided."""
-    logger.info(f"Updating contact ID: {contact_id}")
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM contacts WHERE id = ?', (contact_id,))
-    row = cursor.fetchone()
-
-    if row is None:
-        conn.close()
-        logger.warning(f"Contact ID {contact_id} not found")
-        return jsonify({"error": "Contact not found"}), 404
-
+    logger.info("Updating contact ID: %s", contact_id)
     data = request.get_json()
     if not data:
-        conn.close()
         logger.warning("Invalid request payload for update")
         return jsonify({"error": "No data provided for update"}), 400
 
-    # Prepare updated values, defaulting to existing ones
-    current = dict(row)
-    name  = data.get('name',  current['name'])
-    email = data.get('email', current['email'])
-    phone = data.get('phone', current['phone'])
-
+    # Omitted fields are bound as NULL and COALESCE keeps the stored value,
+    # so no prior SELECT is needed; rowcount tells us whether the ID exists
+    conn = get_db()
+    cursor = conn.cursor()
     cursor.execute(
-        'UPDATE contacts SET name = ?, email = ?, phone = ? WHERE id = ?',
-        (name, email, phone, contact_id)
+        _SQL_UPDATE,
+        (data.get('name'), data.get('email'), data.get('phone'), contact_id)
     )
     conn.commit()
-    conn.close()
 
-    logger.info(f"Contact ID {contact_id} updated successfully")
+    if cursor.rowcount == 0:
+        logger.warning("Contact ID %s not found", contact_id)
+        return jsonify({"error": "Contact not found"}), 404
+
+    logger.info("Contact ID %s updated successfully", contact_id)
     return jsonify({'message': 'Contact updated'})
 
 
@@ -229,54 +274,59 @@ def update_contact(contact_id):
 @handle_exceptions
 def delete_contact(contact_id):
     """Delete the contact with the given ID."""
-    logger.info(f"Deleting contact ID: {contact_id}")
+    logger.info("Deleting contact ID: %s", contact_id)
     conn = get_db()
     cursor = conn.cursor()
-    cursor.execute('SELECT * FROM contacts WHERE id = ?', (contact_id,))
-    row = cursor.fetchone()
+    cursor.execute(_SQL_DELETE, (contact_id,))
+    conn.commit()
 
-    if row is None:
-        conn.close()
-        logger.warning(f"Contact ID {contact_id} not found for deletion")
+    if cursor.rowcount == 0:
+        logger.warning("Contact ID %s not found for deletion", contact_id)
         return jsonify({"error": "Contact not found"}), 404
 
-    cursor.execute('DELETE FROM contacts WHERE id = ?', (contact_id,))
-    conn.commit()
-    conn.close()
-
-    logger.info(f"Contact ID {contact_id} deleted")
+    logger.info("Contact ID %s deleted", contact_id)
     return jsonify({'message': 'Contact deleted'})
 
 
 # Global error handlers
 @app.errorhandler(400)
 def handle_bad_request(e):
-    logger.warning(f"400 Bad Request: {request.path}")
+    logger.warning("400 Bad Request: %s", request.path)
     return jsonify({'error': 'Bad request'}), 400
 
 @app.errorhandler(404)
 def handle_not_found(e):
-    logger.warning(f"404 Not Found: {request.path}")
+    logger.warning("404 Not Found: %s", request.path)
     return jsonify({'error': 'Resource not found'}), 404
 
 @app.errorhandler(405)
 def handle_method_not_allowed(e):
-    logger.warning(f"405 Method Not Allowed: {request.method} {request.path}")
+    logger.warning("405 Method Not Allowed: %s %s", request.method, request.path)
     return jsonify({'error': 'Method not allowed'}), 405
 
 @app.errorhandler(500)
 def handle_server_error(e):
-    logger.error(f"500 Internal Server Error: {e}")
+    logger.error("500 Internal Server Error: %s", e)
     return jsonify({'error': 'Internal server error'}), 500
 
 # Catch-all for undefined routes
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def catch_all(path):
-    logger.warning(f"Attempted access to undefined route: /{path}")
+    logger.warning("Attempted access to undefined route: /%s", path)
     return jsonify({'error': 'Route not found'}), 404
 
 if __name__ == '__main__':
     logger.info("Starting Flask application...")
-    app.run(debug=True)
+    # The Werkzeug debugger and reloader are opt-in via FLASK_DEBUG=1
+    if os.environ.get('FLASK_DEBUG') == '1':
+        app.run(debug=True)
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            logger.info("waitress not installed; using Flask's threaded server")
+            app.run(debug=False, threaded=True)
+        else:
+            serve(app, host='127.0.0.1', port=5000, threads=8)
     logger.info("Flask application stopped.")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# analyzer.py lives in src/ and is run as a script, not imported as a package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
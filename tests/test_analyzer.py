@@ -0,0 +1,307 @@
+import copy
+import os
+import threading
+import warnings
+
+import pytest
+
+import analyzer
+from analyzer import AppClassifier, CodeAnalyzer, DEFAULT_FEATURES
+
+
+def make_analyzer(features=None):
+    if features is None:
+        features = copy.deepcopy(DEFAULT_FEATURES)
+    return CodeAnalyzer(AppClassifier(), features)
+
+
+def missing_names(analyzer_, code, app_type):
+    return [f["name"] for f in analyzer_.find_missing_features(code, app_type)]
+
+
+def test_feature_appended_after_construction_is_detected():
+    features = copy.deepcopy(DEFAULT_FEATURES)
+    an = make_analyzer(features)
+    assert missing_names(an, "root = tk.Tk()", "gui_app") == ["close_button"]
+
+    features["gui_app"].append({
+        "name": "dark_mode",
+        "description": "Dark mode toggle",
+        "importance": "low",
+        "pattern": r"dark_mode|bg=['\"]black['\"]",
+    })
+    code = "import tkinter as tk\nroot = tk.Tk()\nroot.configure(bg='black')\n"
+    assert missing_names(an, code, "gui_app") == ["close_button"]
+    assert missing_names(an, "root = tk.Tk()", "gui_app") == ["close_button", "dark_mode"]
+
+
+def test_feature_pattern_edited_after_construction_is_used():
+    features = copy.deepcopy(DEFAULT_FEATURES)
+    an = make_analyzer(features)
+    assert missing_names(an, "def quit_game(): pass", "game") == ["exit_option"]
+    features["game"][0] = dict(features["game"][0], pattern=r"def\s+quit_game")
+    assert missing_names(an, "def quit_game(): pass", "game") == []
+
+
+def test_required_literal_plain_runs():
+    assert analyzer._required_literal(r"def\s+exit_game") == "exit_game"
+    assert analyzer._required_literal(r"KEYDOWN\s+and\s+K_ESCAPE") == "k_escape"
+    assert analyzer._required_literal(r"Button\(.+['\"](Close|Exit|Quit)['\"]") == "button("
+    assert analyzer._required_literal(r"add_argument.+help=") == "add_argument"
+
+
+def test_required_literal_drops_optional_atoms():
+    assert analyzer._required_literal(r"ab?c") == "a"
+    assert analyzer._required_literal(r"xyz*w") == "xy"
+    assert analyzer._required_literal(r"x[abc]+yz") == "yz"
+    assert analyzer._required_literal(r"(abc)?") is None
+
+
+def test_required_literal_refuses_what_it_cannot_model():
+    assert analyzer._required_literal(r"(?:ab){2}") is None
+    assert analyzer._required_literal(r"ab{0,1}c") is None
+    assert analyzer._required_literal(r"exit\x5fgame") is None
+    assert analyzer._required_literal(r"exit\u005fgame") is None
+    assert analyzer._required_literal(r"exit\N{LOW LINE}game") is None
+    assert analyzer._required_literal(r"(a)b\1") is None
+    assert analyzer._required_literal(r"exit\137game") is None
+    assert analyzer._required_literal(r"(?x) exit_game ") is None
+    assert analyzer._required_literal(r"(?i:exit)_game") is None
+    assert analyzer._required_literal("exit\\") is None
+
+
+def test_required_literal_skips_whole_character_classes():
+    assert analyzer._required_literal(r"[]a]x") == "x"
+    assert analyzer._required_literal(r"[^]]xy") == "xy"
+    assert analyzer._required_literal(r"a(b[)]c)de") == "de"
+    assert analyzer._split_alternatives(r"[]|]x|y") == [r"[]|]x", "y"]
+    assert analyzer._split_alternatives(r"foo\|bar") == [r"foo\|bar"]
+    assert analyzer._split_alternatives(r"(Close|Exit|Quit)") == ["Close", "Exit", "Quit"]
+    features = {"game": [{
+        "name": "exit_option",
+        "description": "Game exit option",
+        "importance": "high",
+        "pattern": r"foo\|bar",
+    }]}
+    assert missing_names(make_analyzer(features), "bar()", "game") == ["exit_option"]
+
+
+def test_patterns_the_prefilter_cannot_model_still_match():
+    cases = [
+        (r"(?:ab){2}", "abab"),
+        (r"exit\x5fgame", "exit_game()"),
+        (r"(?x) exit_game | quit_game  # either name", "quit_game()"),
+        (r"(?x) def \s+ stop", "def   stop"),
+        (r"[]a]x", "]x"),
+        (r"foo\|bar", "foo|bar"),
+    ]
+    for pattern, code in cases:
+        features = {"game": [{
+            "name": "exit_option",
+            "description": "Game exit option",
+            "importance": "high",
+            "pattern": pattern,
+        }]}
+        assert missing_names(make_analyzer(features), code, "game") == [], pattern
+        assert missing_names(make_analyzer(features), "nothing here", "game") == ["exit_option"]
+
+
+def test_unfusable_patterns_match_alongside_other_pending_features(monkeypatch):
+    monkeypatch.setattr(analyzer, "_load_hyperscan", lambda: None)
+    cases = [
+        (r"(?x) exit_game | quit_game", "def bar(): pass\nquit_game()", ["d"]),
+        (r"(?P<x>quit)_(?P=x)", "def bar(): pass\nquit_quit", ["d"]),
+        (r"(['\"])quit\1", "def bar(): pass\nx = 'quit'", []),
+    ]
+    for pattern, code, expected in cases:
+        features = {"game": [
+            {"name": "a", "description": "", "importance": "low", "pattern": r"def\s+bar"},
+            {"name": "b", "description": "", "importance": "high", "pattern": pattern},
+            {"name": "c", "description": "", "importance": "low", "pattern": r"(?P<x>pass)\b"},
+            {"name": "d", "description": "", "importance": "low", "pattern": r"\bx\s*="},
+        ]}
+        assert missing_names(make_analyzer(features), code, "game") == expected, pattern
+        assert missing_names(make_analyzer(features), "def baz(): x", "game") == ["a", "b", "c", "d"]
+
+
+def test_prefilter_agrees_with_regex_case_folding():
+    cases = [
+        (r"KEYDOWN\s+and\s+K_ESCAPE", "KEYDOWN and K_E\u017fCAPE"),
+        (r"def\s+exit_game", "def ex\u0131t_game(): pass"),
+        (r"exit_game", "ex\u0131t_game()"),
+        ("K_E\u017fCAPE", "k_escape"),
+        ("ex\u0131t_game", "EXIT_GAME"),
+    ]
+    for pattern, code in cases:
+        features = {"game": [{
+            "name": "exit_option",
+            "description": "Game exit option",
+            "importance": "high",
+            "pattern": pattern,
+        }]}
+        assert missing_names(make_analyzer(features), code, "game") == [], pattern
+        assert missing_names(make_analyzer(features), "nothing here", "game") == ["exit_option"]
+
+
+def test_multi_feature_matching_does_not_depend_on_hyperscan(monkeypatch):
+    features = {"game": [
+        {"name": "exit_option", "description": "", "importance": "high", "pattern": r"def\s+exit_game"},
+        {"name": "escape_key", "description": "", "importance": "low", "pattern": r"KEYDOWN\s+and\s+K_ESCAPE"},
+    ]}
+    sources = [
+        "def ex\u0131t_game(): pass\nKEYDOWN and K_E\u017fCAPE",
+        "def exit_game(): pass\nkeydown and k_escape",
+        "def exit_game(): pass",
+    ]
+    results = [missing_names(make_analyzer(features), code, "game") for code in sources]
+    assert results == [[], [], ["escape_key"]]
+    monkeypatch.setattr(analyzer, "_load_hyperscan", lambda: None)
+    assert [missing_names(make_analyzer(features), code, "game") for code in sources] == results
+
+
+def test_parsing_analysed_code_emits_no_warnings():
+    code = 'import pygame\npattern = "\\d+"\nwhile running:\n    pass\n'
+    analyzer._parse_code.cache_clear()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert analyzer._parse_code(code) is not None
+        assert code[analyzer._main_loop_offset(code):].startswith("while running:")
+
+
+def test_prediction_cache_is_bounded_and_keyed_by_digest():
+    clf = AppClassifier()
+    for i in range(analyzer._PREDICTION_CACHE_SIZE + 10):
+        clf.predict(f"pygame player {i}")
+    assert len(clf._predictions) == analyzer._PREDICTION_CACHE_SIZE
+    assert all(isinstance(part, (bytes, type(None))) for key in clf._predictions for part in key)
+
+
+def test_keyword_table_is_read_only_and_reassignment_takes_effect():
+    clf = AppClassifier()
+    assert clf.predict("flask server") == "web_app"
+    with pytest.raises((TypeError, AttributeError)):
+        clf.keywords["game"].append("flask")
+    with pytest.raises(TypeError):
+        clf.keywords["game"] = ("flask",)
+    clf.keywords = dict(clf.keywords, game=("flask", "server", "web"))
+    assert clf.predict("flask server") == "game"
+
+
+def test_main_loop_offset_counts_every_line_terminator():
+    sources = [
+        "import pygame\rx = 1\rwhile running:\r    pass\r",
+        "import pygame\r\nx = 1\r\nwhile running:\r\n    pass\r\n",
+        "import pygame\ns = '''a\rb'''\nwhile running:\n    pass\n",
+        "import pygame\nx = 'é'\nwhile running:\n    pass",
+    ]
+    for code in sources:
+        offset = analyzer._main_loop_offset(code)
+        assert code[offset:].startswith("while running:"), repr(code)
+
+
+def test_enhance_code_inserts_before_main_loop_in_cr_only_source():
+    an = make_analyzer()
+    code = "import pygame\rwhile running:\r    pass\r"
+    missing = an.find_missing_features(code, "game")
+    enhanced = an.enhance_code(code, "game", missing)
+    assert enhanced.startswith("import pygame\r\n# === Added: exit_game() function ===")
+    assert enhanced.endswith("while running:\r    pass\r")
+
+
+def test_has_tk_root_accepts_names_and_attributes():
+    assert analyzer._has_tk_root("import tkinter as tk\nroot = tk.Tk()\n")
+    assert analyzer._has_tk_root("class App:\n    def __init__(self):\n        self.root = tk.Tk()\n")
+    assert analyzer._has_tk_root("app.window = Tk.Tk()\n")
+    assert not analyzer._has_tk_root("frame = tk.Tk()\n")
+    assert not analyzer._has_tk_root("# root = tk.Tk()\n")
+
+
+def test_gui_close_button_inserted_for_attribute_root():
+    an = make_analyzer()
+    code = (
+        "import tkinter as tk\n"
+        "class App:\n"
+        "    def __init__(self):\n"
+        "        self.root = tk.Tk()\n"
+        "App().root.mainloop()\n"
+    )
+    missing = an.find_missing_features(code, "gui_app")
+    enhanced = an.enhance_code(code, "gui_app", missing)
+    assert "# === Added: Close Window Button ===" in enhanced
+
+
+def test_analyze_results_are_not_shared_between_calls():
+    an = make_analyzer()
+    code = "import pygame\nwhile running:\n    pass\n"
+    app_type, missing, _ = an.analyze(code, "a pygame game")
+    assert [f["name"] for f in missing] == ["exit_option"]
+    missing.clear()
+    assert [f["name"] for f in an.analyze(code, "a pygame game")[1]] == ["exit_option"]
+
+
+def test_result_cache_is_bounded():
+    an = make_analyzer()
+    for i in range(analyzer._RESULT_CACHE_SIZE + 50):
+        an.find_missing_features(f"x = {i}\n", "cli_tool")
+    assert len(an._results) == analyzer._RESULT_CACHE_SIZE
+
+
+def test_analyze_and_find_missing_share_one_cache():
+    an = make_analyzer()
+    code = "import argparse\nparser = argparse.ArgumentParser()\n"
+    app_type = an.analyze(code, "command line tool")[0]
+    assert len(an._results) == 1
+    an.find_missing_features(code, app_type)
+    assert len(an._results) == 1
+
+
+def test_template_edits_are_visible_to_analyze(monkeypatch):
+    an = make_analyzer()
+    code = "import sys\nprint('command line shell tool')\n"
+    assert "Help Option" in an.analyze(code)[2]
+    monkeypatch.setitem(analyzer.FEATURE_TEMPLATES["cli_tool"], "help_command", "# custom help\n")
+    assert an.analyze(code)[2].endswith("# custom help\n")
+
+
+def test_template_added_after_construction_is_inserted(monkeypatch):
+    features = copy.deepcopy(DEFAULT_FEATURES)
+    an = make_analyzer(features)
+    code = "import tkinter as tk\nroot = tk.Tk()\nbtn = tk.Button(root, text='Close')\nroot.mainloop()\n"
+    assert an.analyze(code)[1] == []
+
+    features["gui_app"].append({
+        "name": "dark_mode",
+        "description": "Dark mode toggle",
+        "importance": "high",
+        "pattern": r"dark_mode",
+    })
+    monkeypatch.setitem(analyzer.FEATURE_TEMPLATES["gui_app"], "dark_mode", "# dark mode\n")
+    app_type, missing, enhanced = an.analyze(code)
+    assert [f["name"] for f in missing] == ["dark_mode"]
+    assert "# dark mode\n" in enhanced
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+def test_read_source_reads_pipes(tmp_path):
+    fifo = tmp_path / "gui.py"
+    os.mkfifo(fifo)
+    code = "import tkinter as tk\r\nroot = tk.Tk()\r\n"
+
+    def write():
+        with open(fifo, "w", newline="") as fp:
+            fp.write(code)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        assert analyzer.read_source(str(fifo)) == code.replace("\r\n", "\n")
+    finally:
+        writer.join()
+
+
+def test_read_source_regular_and_empty_files(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_bytes("x = 'é'\r\ny = 1\r".encode("utf-8"))
+    assert analyzer.read_source(str(path)) == "x = 'é'\ny = 1\n"
+    path.write_bytes(b"")
+    assert analyzer.read_source(str(path)) == ""